@@ -171,6 +171,14 @@ class UnixSocketServer:
         self.socks_readers[sock] = reader
         self._poll.register(sock, _POLL_READ)
 
+    def notify_writable(self, sock, notify=True):
+        """Enable or disable calling handle_writable when the tracked socket
+        is ready for writing."""
+        if notify:
+            self._poll.modify(sock, _POLL_READ | select.POLLOUT)
+        else:
+            self._poll.modify(sock, _POLL_READ)
+
     def untrack(self, sock, fd=None):
         if not fd:
             fd = sock.fileno()
@@ -212,7 +220,8 @@ class UnixSocketServer:
                 # Do not log the error if the connection was (uncleanly)
                 # closed. This can happen if we close it after a bad message
                 # or the client only sends a command and disconnects.
-                if e.errno not in (errno.EBADF, errno.ECONNRESET):
+                if getattr(e, "errno", None) not in (errno.EBADF,
+                                                     errno.ECONNRESET):
                     log.exception(
                         "Failed to read message. Disconnecting "
                         "client.", error=e, sock=sock
@@ -266,6 +275,8 @@ class UnixSocketServer:
                     # Untrack and close the socket if anything about the
                     # connection is reset or closed.
                     self.untrack(sock, fd=fd)
+                elif bitmask & select.POLLOUT:
+                    self.handle_writable(sock)
                 else:
                     raise IPCError(f"Unhandled poll bitmask: {bitmask}")
 
@@ -296,6 +307,11 @@ class UnixSocketServer:
         """Called when a new JSON message for a tracked socket arrives."""
         pass
 
+    def handle_writable(self, sock):
+        """Called when a tracked socket for which notify_writable was enabled
+        is ready for writing."""
+        pass
+
     def post_disconnect_cleanup(self, sock):
         """Called after a client disconnects and untrack is successfully called
         """
@@ -7,7 +7,7 @@ from copy import copy
 from logging import handlers
 from os import getenv
 from queue import Queue
-from threading import Lock
+from threading import Lock, Timer
 
 from .storage import TaskPaths, AnalysisPaths
 from .utils import force_valid_encoding
@@ -562,6 +562,54 @@ def print_warning(msg):
 def print_error(msg):
     print(ColorText.red(force_valid_encoding(msg)))
 
+class BufferedPrinter:
+    """Prints messages like print_info and print_error do, but collects them
+    and writes them to stdout at once. Written when max_lines messages are
+    collected, max_wait seconds after the first collected message, or when
+    flush is called."""
+
+    def __init__(self, max_lines=100, max_wait=1):
+        self.max_lines = max_lines
+        self.max_wait = max_wait
+        self._lines = []
+        self._lock = Lock()
+        self._timer = None
+
+    def _add(self, line):
+        with self._lock:
+            self._lines.append(line)
+            if len(self._lines) >= self.max_lines:
+                self._write()
+            elif not self._timer:
+                # Also write the messages if no new messages arrive.
+                self._timer = Timer(self.max_wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def _write(self):
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._lines:
+            sys.stdout.write("\n".join(self._lines) + "\n")
+            self._lines = []
+
+        sys.stdout.flush()
+
+    def info(self, msg):
+        self._add(ColorText.green(force_valid_encoding(msg)))
+
+    def warning(self, msg):
+        self._add(ColorText.yellow(force_valid_encoding(msg)))
+
+    def error(self, msg):
+        self._add(ColorText.red(force_valid_encoding(msg)))
+
+    def flush(self):
+        with self._lock:
+            self._write()
+
 def exit_error(msg):
     msg = force_valid_encoding(msg)
     if _initialized:
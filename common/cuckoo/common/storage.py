@@ -184,7 +184,6 @@ class _CuckooCWD:
         )
 
     def discover_outdated_versions(self):
-        from pkg_resources import parse_version
         outdated = []
         for pkgname, installed_version in get_package_versions().items():
             cwd_version = self._versions.get(pkgname)
@@ -192,6 +191,12 @@ class _CuckooCWD:
                 outdated.append((pkgname, None, installed_version))
                 continue
 
+            # Equal versions are the common case. Only import pkg_resources,
+            # which is slow to import, if the versions must be compared.
+            if cwd_version == installed_version:
+                continue
+
+            from pkg_resources import parse_version
             if parse_version(cwd_version) < parse_version(installed_version):
                 outdated.append((pkgname, cwd_version, installed_version))
 
@@ -691,6 +696,10 @@ class UnixSocketPaths:
     def result_retriever():
         return Paths.unix_socket("resultretriever.sock")
 
+    @staticmethod
+    def submit_server():
+        return Paths.unix_socket("submit.sock")
+
     @staticmethod
     def machinery_socket(machinery_name, sockname):
         return Paths.unix_socket(f"{machinery_name}_{sockname}.sock")
@@ -1067,18 +1076,56 @@ class InMemoryFile:
             "type": self.type
         }
 
+def prefetch_file(path):
+    """Ask the kernel to start reading the file at the given path into the
+    page cache, so a later read of it does not have to wait for the disk.
+    Does nothing if this is not supported or the file cannot be opened."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
 def enumerate_files(path):
     """Yields all filepaths from a directory."""
     if os.path.isfile(path):
         yield path
 
     elif os.path.isdir(path):
-        for dirname, dirnames, filenames in os.walk(path):
-            for filename in filenames:
-                filepath = os.path.join(dirname, filename)
-
-                if os.path.isfile(filepath):
-                    yield filepath
+        yield from enumerate_dir_files(path)
+
+def enumerate_dir_files(dirpath):
+    """Yields all filepaths from the given directory and its subdirectories.
+    The given path must be a directory."""
+    # Use scandir directly instead of os.walk. The file type of directory
+    # entries is known from the directory listing, so no extra stat is
+    # needed per file. Symlinked directories are not followed.
+    dirpaths = [dirpath]
+    while dirpaths:
+        try:
+            entries = os.scandir(dirpaths.pop())
+        except OSError:
+            continue
+
+        subdirs = []
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.is_file():
+                    yield entry.path
+
+        # Reverse so directories are walked in listing order.
+        dirpaths.extend(reversed(subdirs))
 
 def delete_dirtree(path):
     if not _deletion_allowed(path):
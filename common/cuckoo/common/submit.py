@@ -17,7 +17,9 @@ from .clients import StateControllerClient, ActionFailedError
 from .log import CuckooGlobalLogger
 from .machines import find_in_lists
 from .node import NodeInfos, read_nodesinfos_dump
-from .storage import File, Binaries, Paths, AnalysisPaths, make_analysis_folder
+from .storage import (
+    File, Binaries, Paths, AnalysisPaths, make_analysis_folder, prefetch_file
+)
 from .strictcontainer import (
     Analysis, SubmittedFile, SubmittedURL, Platform, Route
 )
@@ -25,6 +27,10 @@ from .utils import force_valid_encoding, browser_to_tag, parse_bool
 
 log = CuckooGlobalLogger(__name__)
 
+# The amount of files ahead of the currently submitted file that file_bulk
+# asks the kernel to start reading.
+PREFETCH_WINDOW = 8
+
 class SubmissionError(Exception):
     pass
 
@@ -683,7 +689,7 @@ def url(url, settings):
     )
     return analysis_id
 
-def file(filepath, settings, file_name=""):
+def _submit_file(filepath, settings, file_name, binaries_dir):
     if file_name:
         file_name = force_valid_encoding(file_name)
 
@@ -695,7 +701,7 @@ def file(filepath, settings, file_name=""):
     analysis_id, folder_path = make_analysis_folder()
 
     try:
-        binary_helper = Binaries.store(Paths.binaries(), file_helper)
+        binary_helper = Binaries.store(binaries_dir, file_helper)
     except IOError as e:
         raise SubmissionError(e)
 
@@ -708,6 +714,37 @@ def file(filepath, settings, file_name=""):
     _write_analysis(analysis_id, settings, SubmittedFile(**target_info))
     return analysis_id
 
+def file(filepath, settings, file_name=""):
+    return _submit_file(filepath, settings, file_name, Paths.binaries())
+
+def file_bulk(filepaths, settings):
+    """Submit all given file paths with the same settings. The basename of
+    each path is used as its filename. Returns a list of
+    (analysis_id, filepath, error) tuples in the order of the given paths.
+    A failed submission does not stop the submission of the remaining files,
+    its analysis id is None and error is the SubmissionError or OSError."""
+    binaries_dir = Paths.binaries()
+    results = []
+
+    # Let the kernel read the next files while the current one is hashed
+    # and copied.
+    for filepath in filepaths[:PREFETCH_WINDOW]:
+        prefetch_file(filepath)
+
+    for i, filepath in enumerate(filepaths):
+        if i + PREFETCH_WINDOW < len(filepaths):
+            prefetch_file(filepaths[i + PREFETCH_WINDOW])
+
+        try:
+            analysis_id = _submit_file(
+                filepath, settings, os.path.basename(filepath), binaries_dir
+            )
+            results.append((analysis_id, filepath, None))
+        except (SubmissionError, OSError) as e:
+            results.append((None, filepath, e))
+
+    return results
+
 def notify():
     """Send a ping to the state controller to ask it to track all untracked
     analyses. Newly submitted analyses will not be tracked until the state
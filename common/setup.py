@@ -11,11 +11,31 @@ if sys.version[0] == "2":
         "earlier than 3.0.0 supports Python 2."
     )
 
+# Generated by devtools/freezepackages.py. Rerun it after adding or removing
+# a package or data file type.
+PACKAGE_DATA = {
+    "cuckoo.common.data": ["*.txt", ".cuckoopackage"],
+    "cuckoo.common.data.cwd.elasticsearch": ["*.json"],
+    "cuckoo.common.data.cwd.safelist": [".empty"],
+    "cuckoo.common.data.dbmigrations.cuckoodb": ["*.ini", "*.mako"],
+    "cuckoo.common.data.dbmigrations.safelistdb": ["*.ini", "*.mako"],
+}
+PACKAGES = [
+    "cuckoo.common",
+    "cuckoo.common.data",
+    "cuckoo.common.data.cwd",
+    "cuckoo.common.data.cwd.elasticsearch",
+    "cuckoo.common.data.cwd.safelist",
+    "cuckoo.common.data.dbmigrations",
+    "cuckoo.common.data.dbmigrations.cuckoodb",
+    "cuckoo.common.data.dbmigrations.safelistdb",
+]
+
 setuptools.setup(
     name="Cuckoo-common",
     author="",
     author_email="",
-    packages=setuptools.find_namespace_packages(include=["cuckoo.*"]),
+    packages=PACKAGES,
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Information Technology",
@@ -33,7 +53,7 @@ setuptools.setup(
     license="GPLv3",
     description="Cuckoo common and utility code",
     zip_safe=False,
-    include_package_data=True,
+    package_data=PACKAGE_DATA,
     install_requires=[
         "pyyaml",
         "jinja2",
@@ -3,13 +3,30 @@
 
 import os
 import click
+import json
 import logging
-
-from cuckoo.common.storage import cuckoocwd, Paths, CWDError
+import queue
+import re
+import stat
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from functools import lru_cache
+
+from cuckoo.common.config import ConfigurationError
+from cuckoo.common.storage import (
+    cuckoocwd, Paths, UnixSocketPaths, CWDError, enumerate_dir_files
+)
 from cuckoo.common.log import (
-    exit_error, print_info, print_error, print_warning, VERBOSE
+    exit_error, print_info, print_warning, BufferedPrinter, VERBOSE
 )
 
+# Matches each comma separated tag without its surrounding whitespace.
+_TAG_RE = re.compile(r"[^,\s](?:[^,]*[^,\s])?")
+
+# The maximum amount of submission threads a submission server request can
+# use. The server keeps running, so clients must not decide this alone.
+_SUBMITD_MAX_FANOUT = 32
+
 @click.group(invoke_without_command=True)
 @click.option("--cwd", help="Cuckoo Working Directory")
 @click.option("--distributed", is_flag=True, help="Start Cuckoo in distributed mode")
@@ -133,10 +150,14 @@ def get_monitor(zip_path):
     """Use the monitor and stager binaries from the given
     Cuckoo monitor zip file."""
     from cuckoo.common.guest import unpack_monitor_components
-    if not os.path.isfile(zip_path):
-        exit_error(f"Zip file does not exist: {zip_path}")
+    try:
+        unpack_monitor_components(zip_path, cuckoocwd.root)
+    except (FileNotFoundError, IsADirectoryError) as e:
+        # Only report a missing zip if opening the zip itself failed.
+        if e.filename != zip_path:
+            raise
 
-    unpack_monitor_components(zip_path, cuckoocwd.root)
+        exit_error(f"Zip file does not exist: {zip_path}")
 
 @main.group()
 def machine():
@@ -160,7 +181,7 @@ def machine_add(machinery_name, machine_name, config_fields, tags):
         )
 
     machine_dict = {
-        "tags": list(filter(None, [t.strip() for t in tags.split(",")]))
+        "tags": _TAG_RE.findall(tags)
     }
     for entry in config_fields:
         try:
@@ -186,6 +207,50 @@ def machine_add(machinery_name, machine_name, config_fields, tags):
     except StartupError as e:
         exit_error(e)
 
+@machine.command("add-bulk")
+@click.argument("manifest", type=click.Path(exists=True, dir_okay=False))
+def machine_add_bulk(manifest):
+    """Add all machines from a YAML manifest to the configuration of their
+    machinery. The manifest maps machinery names to machine names and their
+    configuration fields. Each machinery configuration file is only
+    written once."""
+    import yaml
+    from cuckoo.common.startup import StartupError
+    from .startup import add_machines
+
+    try:
+        with open(manifest, "r") as fp:
+            machineries = yaml.safe_load(fp)
+    except (OSError, yaml.YAMLError) as e:
+        exit_error(f"Failed to read manifest {manifest}. {e}")
+
+    if not isinstance(machineries, dict):
+        exit_error(
+            "The manifest must map machinery names to machine names and "
+            "their configuration fields"
+        )
+
+    for machinery_name, machines in machineries.items():
+        if not isinstance(machines, dict) or not all(
+            isinstance(fields, dict) for fields in machines.values()
+        ):
+            exit_error(
+                f"The machines of machinery '{machinery_name}' must map "
+                f"machine names to their configuration fields"
+            )
+
+    for machinery_name, machines in machineries.items():
+        try:
+            add_machines(machinery_name, machines)
+        except StartupError as e:
+            exit_error(e)
+
+        for machine_name in machines:
+            print_info(
+                f"Added machine: '{machine_name}' to machinery: "
+                f"'{machinery_name}'"
+            )
+
 @machine.command("import")
 @click.argument("machinery_name")
 @click.argument("vms_path")
@@ -237,33 +302,121 @@ def delete_machines(machinery_name, machine_names):
             print_info(f"Deleted machine: {name}")
 
 
-def _submit_files(settings, *targets):
+def _submit_files(settings, *targets, batch_size=100, fanout=32):
+    """Enumerate the files of the given targets in a separate thread while
+    a maximum of 'fanout' worker threads submit batches of already enumerated
+    files. The batch queue is bounded so that enumeration can not run too far
+    ahead of submission. Targets that cannot be accessed are yielded first."""
     from cuckoo.common import submit
-    from cuckoo.common.storage import enumerate_files
-    files = []
+
+    valid_targets = []
     for path in targets:
-        if not os.path.exists(path):
-            yield None, path, "No such file or directory"
+        try:
+            valid_targets.append((path, os.stat(path).st_mode))
+        except OSError as e:
+            yield None, path, e.strerror
+
+    batches = queue.Queue(maxsize=2 * fanout)
+    results = queue.Queue()
+    stop = threading.Event()
+
+    def _put_batch(batch):
+        # Gives up when the submission is stopped, as no worker may be left
+        # to take batches from the queue.
+        while not stop.is_set():
+            try:
+                batches.put(batch, timeout=1)
+                return True
+            except queue.Full:
+                continue
 
-        files.extend(enumerate_files(path))
+        return False
 
-    for path in files:
+    def _enumerate():
         try:
-            analysis_id = submit.file(
-                path, settings, file_name=os.path.basename(path)
-            )
-            yield analysis_id, path, None
-        except submit.SubmissionError as e:
-            yield None, path, e
+            batch = []
+            for path, st_mode in valid_targets:
+                if stat.S_ISDIR(st_mode):
+                    filepaths = enumerate_dir_files(path)
+                elif stat.S_ISREG(st_mode):
+                    filepaths = (path,)
+                else:
+                    continue
+
+                for filepath in filepaths:
+                    batch.append(filepath)
+                    if len(batch) >= batch_size:
+                        if not _put_batch(batch):
+                            return
+                        batch = []
+
+            if batch:
+                _put_batch(batch)
+        except Exception as e:
+            results.put(e)
+        finally:
+            for _ in range(fanout):
+                if not _put_batch(None):
+                    break
+
+    def _submit():
+        try:
+            while not stop.is_set():
+                try:
+                    batch = batches.get(timeout=1)
+                except queue.Empty:
+                    continue
+
+                if batch is None:
+                    break
+
+                # The settings object is only read during submission and can
+                # therefore be shared by all workers.
+                results.put(submit.file_bulk(batch, settings))
+        except Exception as e:
+            results.put(e)
+        finally:
+            results.put(None)
+
+    threading.Thread(target=_enumerate, daemon=True).start()
+    for _ in range(fanout):
+        threading.Thread(target=_submit, daemon=True).start()
+
+    error = None
+    running = fanout
+    try:
+        while running:
+            result = results.get()
+            if result is None:
+                running -= 1
+            elif isinstance(result, Exception):
+                # Stop all workers, but still yield the results of the
+                # batches they are submitting.
+                if not error:
+                    error = result
+                    stop.set()
+            else:
+                yield from result
+    finally:
+        # Also stops the threads if the caller stops iterating.
+        stop.set()
+
+    if error:
+        raise error
 
-def _submit_urls(settings, *targets):
+def _submit_urls(settings, *targets, fanout=32):
     from cuckoo.common import submit
-    for url in targets:
+
+    def _submit_url(url, settings):
         try:
-            analysis_id = submit.url(url, settings)
-            yield analysis_id, url, None
+            return submit.url(url, settings), url, None
         except submit.SubmissionError as e:
-            yield None, url, e
+            return None, url, e
+
+    with ThreadPoolExecutor(max_workers=fanout) as pool:
+        futures = [pool.submit(_submit_url, url, settings) for url in targets]
+        for future in as_completed(futures):
+            yield future.result()
 
 def _parse_settings(**kwargs):
     """Transform and yield (per platform) settings to a format that the
@@ -302,6 +455,184 @@ def _parse_settings(**kwargs):
             yield plat_index, kw, value, None
 
 
+@lru_cache(maxsize=256)
+def _parse_platform(p_v):
+    """Split a platform,version,tags '--platform' value into its platform,
+    OS version, and tuple of tags. Cached, as the submission server parses
+    the same values for every request."""
+    platform_version = p_v.split(",", 2)
+    os_version = ""
+    tags = ()
+    if len(platform_version) > 1:
+        os_version = platform_version[1]
+    if len(platform_version) > 2:
+        tags = tuple(platform_version[2].split(","))
+
+    return platform_version[0], os_version, tags
+
+def _make_settings(timeout, priority, orig_filename, platform, browser,
+                   command, route_type, route_option, option):
+    """Create analysis settings from the 'submit' command parameters.
+    Raises a SubmissionError if any are invalid."""
+    from cuckoo.common import submit
+
+    s_helper = submit.settings_maker.new_settings()
+    s_helper.set_timeout(timeout)
+    s_helper.set_priority(priority)
+    s_helper.set_orig_filename(orig_filename)
+    s_helper.set_manual(False)
+
+    for p_v in platform:
+        platform_name, os_version, tags = _parse_platform(p_v)
+        s_helper.add_platform(
+            platform=platform_name, os_version=os_version, tags=list(tags)
+        )
+
+    for platform_index, setting_key, value, error in _parse_settings(
+        browser=browser, command=command, route_type=route_type,
+        route_option=route_option, options=option
+    ):
+        if error:
+            raise submit.SubmissionError(error)
+
+        s_helper.set_setting(
+            setting_key, value, platform_index=platform_index
+        )
+
+    return s_helper.make_settings()
+
+def _submit_targets(settings, request):
+    if request["url"]:
+        return _submit_urls(
+            settings, *request["targets"], fanout=request["fanout"]
+        )
+
+    return _submit_files(
+        settings, *request["targets"], batch_size=request["batch_size"],
+        fanout=request["fanout"]
+    )
+
+def _print_results(kind, results):
+    printer = BufferedPrinter()
+    try:
+        for analysis_id, target, error in results:
+            if error:
+                printer.error(f"Failed to submit {kind}: {target}. {error}")
+            else:
+                printer.info(f"Submitted {kind}: {analysis_id} -> {target}")
+    finally:
+        printer.flush()
+
+def _check_submit_request(request):
+    """Returns an error message if the submission request received by the
+    submission server does not have the format that 'cuckoo submit' sends."""
+    if not isinstance(request, dict):
+        return "request must be a JSON object"
+
+    targets = request.get("targets")
+    if not isinstance(targets, list) or \
+            not all(isinstance(target, str) for target in targets):
+        return "targets must be a list of strings"
+
+    if not isinstance(request.get("url"), bool):
+        return "url must be a boolean"
+
+    if not isinstance(request.get("settings"), dict):
+        return "settings must be a JSON object"
+
+    for key in ("batch_size", "fanout"):
+        value = request.get(key)
+        # Bool is a subclass of int.
+        if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+            return f"{key} must be an integer of 1 or higher"
+
+    return None
+
+def _handle_submit_request(request):
+    """Handles a submission request received by the submission server. Yields
+    the responses to send to the client."""
+    from cuckoo.common import submit
+
+    error = _check_submit_request(request)
+    if error:
+        yield {"done": True, "error": f"Invalid submission request: {error}"}
+        return
+
+    request = dict(
+        request, fanout=min(request["fanout"], _SUBMITD_MAX_FANOUT)
+    )
+    try:
+        settings = _make_settings(**request["settings"])
+    except submit.SubmissionError as e:
+        yield {"done": True, "error": f"Submission failed: {e}"}
+        return
+
+    results = []
+    try:
+        for analysis_id, target, error in _submit_targets(settings, request):
+            results.append(
+                (analysis_id, target, str(error) if error else None)
+            )
+            if len(results) >= request["batch_size"]:
+                yield {"results": results}
+                results = []
+    except Exception:
+        # Still report the files that were submitted before the error.
+        if results:
+            yield {"results": results}
+        raise
+    finally:
+        # Analyses created before an error must also be tracked.
+        notify_error = None
+        try:
+            submit.notify()
+        except submit.SubmissionError as e:
+            notify_error = str(e)
+
+    if results:
+        yield {"results": results}
+
+    yield {"done": True, "notify_error": notify_error}
+
+def _submit_with_server(sockpath, kind, request):
+    """Send the submission request to the running submission server and print
+    its results. Returns False if the server could not be reached."""
+    from cuckoo.common.ipc import IPCError, ReaderWriter
+    from .submitserver import SubmitServerClient
+
+    # The server disconnects clients that send messages of this size or
+    # larger.
+    if len(json.dumps(request).encode()) >= ReaderWriter.MAX_INFO_BUF:
+        print_warning(
+            "Submission request is too large for the submission server. "
+            "Submitting without it."
+        )
+        return False
+
+    client = SubmitServerClient(sockpath)
+    try:
+        client.connect(maxtries=1)
+    except IPCError as e:
+        print_warning(
+            f"Could not connect to submission server. Submitting without "
+            f"it. {e}"
+        )
+        return False
+
+    try:
+        for response in client.submit(request):
+            _print_results(kind, response.get("results", []))
+            if response.get("error"):
+                exit_error(response["error"])
+            if response.get("notify_error"):
+                print_warning(response["notify_error"])
+    except IPCError as e:
+        exit_error(f"Lost connection to submission server: {e}")
+    finally:
+        client.cleanup()
+
+    return True
+
 @main.command("submit")
 @click.argument("target", nargs=-1)
 @click.option("-u", "--url", is_flag=True, help="Submit URL(s) instead of files.")
@@ -320,8 +651,11 @@ def _parse_settings(**kwargs):
 @click.option("--route-type", multiple=True, help="The route type to use. (Supports per platform configuration)")
 @click.option("--route-option", multiple=True, help="Option for given route. Key=value format. (Supports per platform configuration)")
 @click.option("--option", multiple=True, help="Option for the analysis. Key=value format.")
+@click.option("--batch-size", type=click.IntRange(min=1), default=100, help="The amount of files to submit per batch.")
+@click.option("--fanout", type=click.IntRange(min=1), default=32, help="The maximum amount of batches or URLs that are submitted concurrently.")
 def submission(target, url, platform, timeout, priority, orig_filename,
-               browser, command, route_type, route_option, option):
+               browser, command, route_type, route_option, option,
+               batch_size, fanout):
     """Create a new file/url analysis. Use index,value of the used --platform
     parameter to specify a platform specific setting. No index given means the
     setting is the default for all platforms.
@@ -331,80 +665,74 @@ def submission(target, url, platform, timeout, priority, orig_filename,
     if not target:
         exit_error("No target specified")
 
-    from cuckoo.common.config import cfg, ConfigurationError
-    from cuckoo.common.storage import Paths
+    kind = "URL" if url else "file"
+    if not url:
+        # The submission server does not share our working directory.
+        target = [os.path.abspath(path) for path in target]
+
+    request = {
+        "url": url,
+        "targets": list(target),
+        "batch_size": batch_size,
+        "fanout": fanout,
+        "settings": {
+            "timeout": timeout,
+            "priority": priority,
+            "orig_filename": orig_filename,
+            "platform": list(platform),
+            "browser": list(browser),
+            "command": list(command),
+            "route_type": list(route_type),
+            "route_option": list(route_option),
+            "option": list(option)
+        }
+    }
+
+    sockpath = UnixSocketPaths.submit_server()
+    if sockpath.exists() and _submit_with_server(sockpath, kind, request):
+        return
+
     from cuckoo.common import submit
-    from cuckoo.common.startup import load_configuration, StartupError
+    from cuckoo.common.startup import StartupError
+    from .startup import init_submission_settings
 
     try:
-        load_configuration("analysissettings.yaml")
-        submit.settings_maker.set_limits(
-            cfg("analysissettings.yaml", "limits")
-        )
-        submit.settings_maker.set_defaults(
-            cfg("analysissettings.yaml", "default")
-        )
-        submit.settings_maker.set_nodesinfosdump_path(Paths.nodeinfos_dump())
+        init_submission_settings()
+        settings = _make_settings(**request["settings"])
     except (submit.SubmissionError, StartupError, ConfigurationError) as e:
         exit_error(f"Submission failed: {e}")
 
     try:
-        s_helper = submit.settings_maker.new_settings()
-        s_helper.set_timeout(timeout)
-        s_helper.set_priority(priority)
-        s_helper.set_orig_filename(orig_filename)
-        s_helper.set_manual(False)
-
-        for p_v in platform:
-            # Split platform,version,tags into usable values
-            platform_version = p_v.split(",", 2)
-
-            if len(platform_version) == 1:
-                s_helper.add_platform(platform=platform_version[0])
-
-            elif len(platform_version) == 2:
-                s_helper.add_platform(
-                    platform=platform_version[0],
-                    os_version=platform_version[1]
-                )
-            elif len(platform_version) == 3:
-                s_helper.add_platform(
-                    platform=platform_version[0],
-                    os_version=platform_version[1],
-                    tags=platform_version[2].split(",")
-                )
-
-        for platform_index, setting_key, value, error in _parse_settings(
-            browser=browser, command=command, route_type=route_type,
-            route_option=route_option, options=option
-        ):
-            if error:
-                raise submit.SubmissionError(error)
+        _print_results(kind, _submit_targets(settings, request))
+    finally:
+        try:
+            submit.notify()
+        except submit.SubmissionError as e:
+            print_warning(e)
 
-            s_helper.set_setting(
-                setting_key, value, platform_index=platform_index
-            )
+@main.command("submitd")
+@click.pass_context
+def submitd(ctx):
+    """Start a submission server that 'cuckoo submit' sends its submissions
+    to if it is running. Keeps settings and node information loaded between
+    submissions."""
+    from cuckoo.common.startup import StartupError
+    from cuckoo.common.shutdown import (
+        register_shutdown, call_registered_shutdowns
+    )
+    from .startup import start_submitserver
 
-        settings = s_helper.make_settings()
-    except submit.SubmissionError as e:
-        exit_error(f"Submission failed: {e}")
+    def _stopmsg():
+        print("Stopping submission server..")
 
-    if url:
-        submitter, kind = _submit_urls, "URL"
-    else:
-        submitter, kind = _submit_files, "file"
+    register_shutdown(_stopmsg, order=1)
 
     try:
-        for analysis_id, target, error in submitter(settings, *target):
-            if error:
-                print_error(f"Failed to submit {kind}: {target}. {error}")
-            else:
-                print_info(f"Submitted {kind}: {analysis_id} -> {target}")
+        start_submitserver(ctx.parent.loglevel, _handle_submit_request)
+    except StartupError as e:
+        exit_error(f"Failure during submission server startup: {e}")
     finally:
-        try:
-            submit.notify()
-        except submit.SubmissionError as e:
-            print_warning(e)
+        call_registered_shutdowns()
 
 
 @main.group(invoke_without_command=True)
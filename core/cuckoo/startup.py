@@ -121,6 +121,15 @@ def add_machine(machinery_name, name, machine_dict):
     except MachineryError as e:
         raise StartupError(f"Failed to add machine. {e}")
 
+def add_machines(machinery_name, machines):
+    from cuckoo.machineries.configtools import add_machines
+    from cuckoo.machineries.errors import MachineryError
+
+    try:
+        add_machines(machinery_name, machines)
+    except MachineryError as e:
+        raise StartupError(f"Failed to add machines. {e}")
+
 
 def start_importcontroller(cuckooctx):
     from .control import ImportController
@@ -163,6 +172,55 @@ def start_importmode(loglevel):
     log.info("Starting import controller")
     start_importcontroller(ctx)
 
+def init_submission_settings():
+    """Load the analysis settings configuration and node information used by
+    the submission settings maker. Raises a StartupError if the configuration
+    cannot be loaded and a SubmissionError if the node information cannot."""
+    from cuckoo.common import submit
+    from cuckoo.common.startup import load_configuration
+
+    load_configuration("analysissettings.yaml")
+    submit.settings_maker.set_limits(
+        config.cfg("analysissettings.yaml", "limits")
+    )
+    submit.settings_maker.set_defaults(
+        config.cfg("analysissettings.yaml", "default")
+    )
+    submit.settings_maker.set_nodesinfosdump_path(Paths.nodeinfos_dump())
+
+def start_submitserver(loglevel, handler):
+    from cuckoo.common import submit
+    from cuckoo.common.ipc import IPCError
+    from cuckoo.common.startup import init_global_logging
+
+    from .submitserver import SubmitServer
+
+    sockpath = UnixSocketPaths.submit_server()
+    if sockpath.exists():
+        raise StartupError(
+            f"Failed to start submission server: "
+            f"Unix socket path already exists: {sockpath}"
+        )
+
+    # Initialize globing logging to submitd.log
+    init_global_logging(loglevel, Paths.log("submitd.log"))
+
+    log.info("Starting submission server")
+    log.info("Loading submission settings")
+    try:
+        init_submission_settings()
+    except submit.SubmissionError as e:
+        raise StartupError(f"Failed to load node information: {e}")
+
+    server = SubmitServer(sockpath, handler)
+    shutdown.register_shutdown(server.stop)
+
+    log.info("Accepting submissions", sockpath=sockpath)
+    try:
+        server.start()
+    except IPCError as e:
+        raise StartupError(f"Failed to start submission server: {e}")
+
 def start_localnode(cuckooctx):
     from cuckoo.node.startup import start_local
 
@@ -0,0 +1,184 @@
+# Copyright (C) 2019-2021 Estonian Information System Authority.
+# See the file 'LICENSE' for copying permission.
+
+import json
+import queue
+import threading
+
+from cuckoo.common.ipc import (
+    UnixSocketServer, UnixSockClient, ReaderWriter, IPCError
+)
+from cuckoo.common.log import CuckooGlobalLogger
+
+log = CuckooGlobalLogger(__name__)
+
+class _SubmitWorker(threading.Thread):
+
+    def __init__(self, server):
+        super().__init__()
+
+        self.server = server
+        self._do_run = True
+
+    def stop(self):
+        self._do_run = False
+
+    def run(self):
+        while self._do_run:
+            try:
+                readerwriter, request = self.server.workqueue.get(timeout=1)
+            except queue.Empty:
+                continue
+
+            try:
+                for response in self.server.handler(request):
+                    self.server.queue_response(readerwriter, response)
+            except Exception as e:
+                log.exception(
+                    "Unhandled error while handling submission request",
+                    error=e, request=repr(request)
+                )
+                self.server.queue_response(
+                    readerwriter, {
+                        "done": True,
+                        "error": f"Unexpected error during submission: {e}"
+                    }
+                )
+            finally:
+                self.server.queue_response(readerwriter, None, close=True)
+
+
+class SubmitServer(UnixSocketServer):
+    """Accepts submission requests from 'cuckoo submit' clients. Each request
+    is handled by one of the worker threads using the given handler. The
+    handler must be a generator that yields the response messages for a
+    request. The final message must contain 'done'. Responses are sent from
+    the accepting thread. Responses a client is not ready to receive yet are
+    buffered per connection and sent when its socket becomes writable."""
+
+    NUM_WORKERS = 4
+
+    def __init__(self, sock_path, handler):
+        super().__init__(sock_path)
+        self.handler = handler
+        self.workers = []
+        self.workqueue = queue.Queue()
+        self.responses = queue.Queue()
+        self._outbufs = {}
+        self._close_after_send = set()
+
+    def start(self):
+        self.create_socket()
+        for _ in range(self.NUM_WORKERS):
+            worker = _SubmitWorker(self)
+            worker.daemon = True
+            self.workers.append(worker)
+            worker.start()
+
+        # A short timeout, as responses are only sent after the poll returns.
+        self.start_accepting(timeout=0.1)
+
+        for worker in self.workers:
+            worker.join(timeout=20)
+
+    def stop(self):
+        if not self.do_run:
+            return
+
+        super().stop()
+
+        log.info("Stopping submission server")
+        for worker in self.workers:
+            worker.stop()
+
+        self.cleanup()
+
+    def handle_connection(self, sock, addr):
+        self.track(sock, ReaderWriter(sock))
+        self._outbufs[sock] = bytearray()
+
+    def handle_message(self, sock, msg):
+        readerwriter = self.socks_readers.get(sock)
+        if not readerwriter:
+            return
+
+        self.workqueue.put((readerwriter, msg))
+
+    def handle_writable(self, sock):
+        self._send_buffered(sock)
+
+    def post_disconnect_cleanup(self, sock):
+        self._outbufs.pop(sock, None)
+        self._close_after_send.discard(sock)
+
+    def queue_response(self, readerwriter, response, close=False):
+        self.responses.put((readerwriter, response, close))
+
+    def _send_buffered(self, sock):
+        outbuf = self._outbufs.get(sock)
+        if outbuf is None:
+            return
+
+        while outbuf:
+            try:
+                sent = sock.send(outbuf)
+            except BlockingIOError:
+                # The client is not reading fast enough. Continue when its
+                # socket is writable again.
+                self.notify_writable(sock)
+                return
+            except OSError as e:
+                log.debug("Failed to send response.", error=e)
+                self.untrack(sock)
+                return
+
+            del outbuf[:sent]
+
+        self.notify_writable(sock, notify=False)
+        if sock in self._close_after_send:
+            self.untrack(sock)
+
+    def timeout_action(self):
+        pending = set()
+        while not self.responses.empty():
+            try:
+                readerwriter, response, close = self.responses.get(block=False)
+            except queue.Empty:
+                break
+
+            sock = readerwriter.sock
+            outbuf = self._outbufs.get(sock)
+            # The client already disconnected.
+            if outbuf is None:
+                continue
+
+            if response is not None:
+                outbuf += f"{json.dumps(response)}\n".encode()
+            if close:
+                self._close_after_send.add(sock)
+
+            pending.add(sock)
+
+        for sock in pending:
+            self._send_buffered(sock)
+
+
+class SubmitServerClient(UnixSockClient):
+
+    def submit(self, request):
+        """Send the submission request and yield the received responses until
+        the final response. Raises an IPCError if the connection is lost
+        before the final response was received."""
+        self.send_json_message(request)
+        while True:
+            try:
+                response = self.recv_json_message()
+            except ValueError as e:
+                raise IPCError(e)
+
+            if response is None:
+                raise IPCError("Submission server closed the connection")
+
+            yield response
+            if response.get("done"):
+                break
@@ -5,6 +5,7 @@
 import setuptools
 import platform
 import sys
+from pathlib import Path
 
 if sys.version[0] == "2":
     sys.exit(
@@ -15,11 +16,26 @@ if sys.version[0] == "2":
 if platform.system().lower() != "linux":
     sys.exit("Cuckoo 3 only supports Linux hosts")
 
+# Generated by devtools/freezepackages.py. Rerun it after adding or removing
+# a package or data file type.
+PACKAGE_DATA = {
+    "cuckoo.data": [".cuckoopackage"],
+    "cuckoo.data.conftemplates": ["*.jinja2"],
+    "cuckoo.data.dbmigrations.taskqueuedb": ["*.ini", "*.mako"],
+}
+PACKAGES = [
+    "cuckoo.data",
+    "cuckoo.data.conftemplates",
+    "cuckoo.data.dbmigrations",
+    "cuckoo.data.dbmigrations.taskqueuedb",
+    "cuckoo.scripts",
+]
+
 setuptools.setup(
     name="Cuckoo",
     author="",
     author_email="",
-    packages=setuptools.find_namespace_packages(include=["cuckoo.*"]),
+    packages=PACKAGES,
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Environment :: Console",
@@ -45,8 +61,11 @@ setuptools.setup(
     url="https://cuckoosandbox.org/",
     license="GPLv3",
     description="Automated Malware Analysis System",
-    long_description=open("README.rst", "r").read(),
-    include_package_data=True,
+    long_description=Path(__file__).with_name("README.rst").read_text(
+        encoding="utf-8"
+    ),
+    long_description_content_type="text/x-rst",
+    package_data=PACKAGE_DATA,
     zip_safe=False,
     entry_points={
         "console_scripts": [
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# Copyright (C) 2019-2021 Estonian Information System Authority.
+# See the file 'LICENSE' for copying permission.
+
+"""Writes the packages and package data file patterns of each Cuckoo
+distribution to the PACKAGES list and PACKAGE_DATA dict in its setup.py, so
+installing it does not have to search for packages and data files. Run it
+after adding or removing a package or data file type. With --check, only
+reports the setup.py files that are outdated and exits with 1 if there
+are any."""
+
+import os
+import re
+import sys
+
+import setuptools
+
+DISTRIBUTIONS = ("common", "core", "machineries", "node", "processing", "web")
+
+_PACKAGES_RE = re.compile(
+    r"^PACKAGES = \[\n.*?^\]\n", re.MULTILINE | re.DOTALL
+)
+_PACKAGE_DATA_RE = re.compile(
+    r"^PACKAGE_DATA = \{\n.*?^\}\n", re.MULTILINE | re.DOTALL
+)
+
+_NOT_DATA_EXTS = (".py", ".pyc", ".pyo")
+
+# Packages whose files are only needed to build other package data, such as
+# the web frontend sources.
+_NOT_DATA_PACKAGES = ("cuckoo.web.clientsrc",)
+
+def find_packages(dist_path):
+    return sorted(
+        setuptools.find_namespace_packages(
+            where=dist_path, include=["cuckoo.*"]
+        )
+    )
+
+def find_package_data(dist_path, packages):
+    """Returns a package:file patterns dict of the data files directly in
+    each package directory, skipping the packages in _NOT_DATA_PACKAGES.
+    Files with an extension are matched by extension. Files without one and
+    dotfiles are matched by name, as the '*' pattern does not match them."""
+    package_data = {}
+    for package in packages:
+        if package.startswith(_NOT_DATA_PACKAGES):
+            continue
+
+        package_path = os.path.join(dist_path, *package.split("."))
+        patterns = set()
+        for entry in os.scandir(package_path):
+            if not entry.is_file():
+                continue
+
+            ext = os.path.splitext(entry.name)[1]
+            if ext in _NOT_DATA_EXTS:
+                continue
+
+            if ext and not entry.name.startswith("."):
+                patterns.add(f"*{ext}")
+            else:
+                patterns.add(entry.name)
+
+        if patterns:
+            package_data[package] = sorted(patterns)
+
+    return package_data
+
+def make_packages_list(packages):
+    entries = "".join(f"    \"{package}\",\n" for package in packages)
+    return f"PACKAGES = [\n{entries}]\n"
+
+def make_package_data_dict(package_data):
+    entries = ""
+    for package, patterns in package_data.items():
+        quoted = ", ".join(f"\"{pattern}\"" for pattern in patterns)
+        entries += f"    \"{package}\": [{quoted}],\n"
+
+    return f"PACKAGE_DATA = {{\n{entries}}}\n"
+
+def _replace_block(setup_path, setup_code, regex, block):
+    match = regex.search(setup_code)
+    if not match:
+        sys.exit(f"No match for {regex.pattern!r} found in {setup_path}")
+
+    return setup_code[:match.start()] + block + setup_code[match.end():]
+
+def freeze(dist_path, check_only=False):
+    """Returns True if the PACKAGES list and PACKAGE_DATA dict in the
+    setup.py of the given distribution path were up to date."""
+    setup_path = os.path.join(dist_path, "setup.py")
+    with open(setup_path, "r") as fp:
+        setup_code = fp.read()
+
+    packages = find_packages(dist_path)
+    updated_code = _replace_block(
+        setup_path, setup_code, _PACKAGES_RE, make_packages_list(packages)
+    )
+    updated_code = _replace_block(
+        setup_path, updated_code, _PACKAGE_DATA_RE,
+        make_package_data_dict(find_package_data(dist_path, packages))
+    )
+    if updated_code == setup_code:
+        return True
+
+    if check_only:
+        print(f"Outdated: {setup_path}")
+        return False
+
+    with open(setup_path, "w") as fp:
+        fp.write(updated_code)
+
+    print(f"Updated: {setup_path}")
+    return False
+
+if __name__ == "__main__":
+    check_only = "--check" in sys.argv[1:]
+    repo_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    up_to_date = True
+    for dist in DISTRIBUTIONS:
+        if not freeze(os.path.join(repo_root, dist), check_only=check_only):
+            up_to_date = False
+
+    if check_only and not up_to_date:
+        sys.exit(1)
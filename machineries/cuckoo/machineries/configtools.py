@@ -85,6 +85,15 @@ def add_machine(machinery_name, machine_name, machine_dict):
     _add_machine(machinery_name, loaders, machine_name, machine_dict)
     _update_machinery_config(machinery_name, loaders)
 
+def add_machines(machinery_name, machines):
+    """Add all machines of the machine name:machine dict mapping. The
+    configuration file is only written if all machines are valid."""
+    loaders = _get_existing_loaders(machinery_name)
+    for machine_name, machine_dict in machines.items():
+        _add_machine(machinery_name, loaders, machine_name, machine_dict)
+
+    _update_machinery_config(machinery_name, loaders)
+
 _VMCLOAK_MACHINEINFO_FUNC = "vmcloak_info_to_machineconf"
 _MACHINEINFO_NAME = "machineinfo.json"
 
@@ -11,11 +11,24 @@ if sys.version[0] == "2":
         "earlier than 3.0.0 supports Python 2."
     )
 
+# Generated by devtools/freezepackages.py. Rerun it after adding or removing
+# a package or data file type.
+PACKAGE_DATA = {
+    "cuckoo.machineries.data": [".cuckoopackage"],
+    "cuckoo.machineries.data.conftemplates": ["*.jinja2"],
+}
+PACKAGES = [
+    "cuckoo.machineries",
+    "cuckoo.machineries.data",
+    "cuckoo.machineries.data.conftemplates",
+    "cuckoo.machineries.modules",
+]
+
 setuptools.setup(
     name="Cuckoo-machineries",
     author="",
     author_email="",
-    packages=setuptools.find_namespace_packages(include=["cuckoo.*"]),
+    packages=PACKAGES,
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Information Technology",
@@ -33,7 +46,7 @@ setuptools.setup(
     license="GPLv3",
     description="Cuckoo machinery modules and helpers",
     zip_safe=False,
-    include_package_data=True,
+    package_data=PACKAGE_DATA,
     install_requires=[
         "Cuckoo-common==0.1.0",
     ],
@@ -15,11 +15,29 @@ if sys.version[0] == "2":
 if platform.system().lower() != "linux":
     sys.exit("Cuckoo 3 only supports Linux hosts")
 
+# Generated by devtools/freezepackages.py. Rerun it after adding or removing
+# a package or data file type.
+PACKAGE_DATA = {
+    "cuckoo.node.data": ["*.txt", ".cuckoopackage"],
+    "cuckoo.node.data.conftemplates": ["*.jinja2"],
+    "cuckoo.node.data.cwd.rooter.scripts": ["*.sh"],
+}
+PACKAGES = [
+    "cuckoo.node",
+    "cuckoo.node.data",
+    "cuckoo.node.data.conftemplates",
+    "cuckoo.node.data.cwd",
+    "cuckoo.node.data.cwd.rooter",
+    "cuckoo.node.data.cwd.rooter.scripts",
+    "cuckoo.node.rooter",
+    "cuckoo.node.scripts",
+]
+
 setuptools.setup(
     name="Cuckoo-node",
     author="",
     author_email="",
-    packages=setuptools.find_namespace_packages(include=["cuckoo.*"]),
+    packages=PACKAGES,
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Information Technology",
@@ -43,7 +61,7 @@ setuptools.setup(
             "cuckoorooter = cuckoo.node.scripts.rooter:main"
         ],
     },
-    include_package_data=True,
+    package_data=PACKAGE_DATA,
     install_requires=[
         "Cuckoo-common==0.1.0",
         "Cuckoo-machineries==0.1.0",
@@ -11,11 +11,45 @@ if sys.version[0] == "2":
         "earlier than 3.0.0 supports Python 2."
     )
 
+# Generated by devtools/freezepackages.py. Rerun it after adding or removing
+# a package or data file type.
+PACKAGE_DATA = {
+    "cuckoo.processing.data": ["*.txt", ".cuckoopackage"],
+    "cuckoo.processing.data.conftemplates": ["*.jinja2"],
+    "cuckoo.processing.data.cwd.signatures.cuckoo.pattern": [".empty"],
+    "cuckoo.processing.data.cwd.signatures.mitreattack": ["*.json"],
+    "cuckoo.processing.data.cwd.signatures.peutils": ["*.txt"],
+}
+PACKAGES = [
+    "cuckoo.processing",
+    "cuckoo.processing.cfgextr",
+    "cuckoo.processing.data",
+    "cuckoo.processing.data.conftemplates",
+    "cuckoo.processing.data.cwd",
+    "cuckoo.processing.data.cwd.signatures",
+    "cuckoo.processing.data.cwd.signatures.cuckoo",
+    "cuckoo.processing.data.cwd.signatures.cuckoo.pattern",
+    "cuckoo.processing.data.cwd.signatures.mitreattack",
+    "cuckoo.processing.data.cwd.signatures.peutils",
+    "cuckoo.processing.event",
+    "cuckoo.processing.event.translate",
+    "cuckoo.processing.event.translate.threemon",
+    "cuckoo.processing.identification",
+    "cuckoo.processing.post",
+    "cuckoo.processing.post.eventconsumer",
+    "cuckoo.processing.pre",
+    "cuckoo.processing.reporting",
+    "cuckoo.processing.safelist",
+    "cuckoo.processing.scripts",
+    "cuckoo.processing.signatures",
+    "cuckoo.processing.static",
+]
+
 setuptools.setup(
     name="Cuckoo-processing",
     author="",
     author_email="",
-    packages=setuptools.find_namespace_packages(include=["cuckoo.*"]),
+    packages=PACKAGES,
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Information Technology",
@@ -33,7 +67,7 @@ setuptools.setup(
     license="GPLv3",
     description="Cuckoo data processing helpers and modules",
     zip_safe=False,
-    include_package_data=True,
+    package_data=PACKAGE_DATA,
     install_requires=[
         "Cuckoo-common==0.1.0",
         "sflock>=1.0, <1.1",
@@ -11,11 +11,87 @@ if sys.version[0] == "2":
         "earlier than 3.0.0 supports Python 2."
     )
 
+# Generated by devtools/freezepackages.py. Rerun it after adding or removing
+# a package or data file type.
+PACKAGE_DATA = {
+    "cuckoo.web.data": ["*.txt", ".cuckoopackage"],
+    "cuckoo.web.data.conftemplates": ["*.jinja2"],
+    "cuckoo.web.static.css": ["*.css"],
+    "cuckoo.web.static.images": ["*.png"],
+    "cuckoo.web.static.js": ["*.js"],
+    "cuckoo.web.static.webfonts": ["*.eot", "*.svg", "*.ttf", "*.woff", "*.woff2"],
+    "cuckoo.web.templates": ["*.jinja2"],
+    "cuckoo.web.templates.analyses": ["*.jinja2"],
+    "cuckoo.web.templates.analysis": ["*.jinja2"],
+    "cuckoo.web.templates.analysis.components": ["*.jinja2"],
+    "cuckoo.web.templates.compare": ["*.jinja2"],
+    "cuckoo.web.templates.dashboard": ["*.jinja2"],
+    "cuckoo.web.templates.partial": ["*.jinja2"],
+    "cuckoo.web.templates.search": ["*.jinja2"],
+    "cuckoo.web.templates.submit": ["*.jinja2"],
+    "cuckoo.web.templates.submit.partial": ["*.jinja2"],
+    "cuckoo.web.templates.task": ["*.jinja2"],
+    "cuckoo.web.templates.task.components": ["*.jinja2"],
+    "cuckoo.web.templates.task.components.network": ["*.jinja2"],
+}
+PACKAGES = [
+    "cuckoo.web",
+    "cuckoo.web.analyses",
+    "cuckoo.web.analysis",
+    "cuckoo.web.analysis.task",
+    "cuckoo.web.api",
+    "cuckoo.web.api.analyses",
+    "cuckoo.web.api.analysis",
+    "cuckoo.web.api.analysis.task",
+    "cuckoo.web.api.importing",
+    "cuckoo.web.api.submit",
+    "cuckoo.web.api.targets",
+    "cuckoo.web.api.targets.file",
+    "cuckoo.web.clientsrc",
+    "cuckoo.web.clientsrc.docs",
+    "cuckoo.web.clientsrc.docs.package",
+    "cuckoo.web.clientsrc.docs.ui-kit",
+    "cuckoo.web.clientsrc.sass",
+    "cuckoo.web.compare",
+    "cuckoo.web.dashboard",
+    "cuckoo.web.data",
+    "cuckoo.web.data.conftemplates",
+    "cuckoo.web.data.cwd",
+    "cuckoo.web.data.cwd.web",
+    "cuckoo.web.search",
+    "cuckoo.web.static",
+    "cuckoo.web.static.css",
+    "cuckoo.web.static.images",
+    "cuckoo.web.static.js",
+    "cuckoo.web.static.webfonts",
+    "cuckoo.web.submit",
+    "cuckoo.web.templates",
+    "cuckoo.web.templates.analyses",
+    "cuckoo.web.templates.analysis",
+    "cuckoo.web.templates.analysis.components",
+    "cuckoo.web.templates.compare",
+    "cuckoo.web.templates.dashboard",
+    "cuckoo.web.templates.partial",
+    "cuckoo.web.templates.search",
+    "cuckoo.web.templates.submit",
+    "cuckoo.web.templates.submit.partial",
+    "cuckoo.web.templates.task",
+    "cuckoo.web.templates.task.components",
+    "cuckoo.web.templates.task.components.network",
+    "cuckoo.web.uiapi",
+    "cuckoo.web.uiapi.analyses",
+    "cuckoo.web.uiapi.analyses.task",
+    "cuckoo.web.uiapi.search",
+    "cuckoo.web.uiapi.statistics",
+    "cuckoo.web.web",
+    "cuckoo.web.web.jinja",
+]
+
 setuptools.setup(
     name="Cuckoo-web",
     author="",
     author_email="",
-    packages=setuptools.find_namespace_packages(include=["cuckoo.*"]),
+    packages=PACKAGES,
     classifiers=[
         "Development Status :: 5 - Production/Stable",
         "Intended Audience :: Information Technology",
@@ -33,7 +109,7 @@ setuptools.setup(
     license="GPLv3",
     description="Cuckoo web api and interface",
     zip_safe=False,
-    include_package_data=True,
+    package_data=PACKAGE_DATA,
     install_requires=[
         "Cuckoo-common==0.1.0",
         "django",